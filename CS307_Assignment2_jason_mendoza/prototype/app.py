@@ -13,85 +13,416 @@ Run:
 """
 
 from __future__ import annotations
-from dataclasses import dataclass, asdict
-from datetime import date, datetime
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
+import atexit
 import json
-from typing import List, Dict, Optional
+import os
+import re
+import sys
+from itertools import count, islice
+import secrets
+from typing import List, Dict, Iterator, Optional, Tuple
 
+# Prefer a fast JSON codec when one is installed; the stdlib works too.
+try:
+    import orjson
 
-DATA_FILE = Path("data.json")
+    def _json_dumps_line(row: Dict) -> bytes:
+        return orjson.dumps(row)
 
+    def _json_loads(data: bytes) -> Dict:
+        return orjson.loads(data)
 
-@dataclass(frozen=True)
+except ImportError:
+    try:
+        import ujson as _fast_json
+
+        def _json_dumps_line(row: Dict) -> bytes:
+            return _fast_json.dumps(row).encode("utf-8")
+
+    except ImportError:
+        _fast_json = json
+
+        def _json_dumps_line(row: Dict) -> bytes:
+            # Compact separators: the default ", " / ": " padding is
+            # dead weight on every stored byte.
+            return json.dumps(row, separators=(",", ":")).encode("utf-8")
+
+    def _json_loads(data: bytes) -> Dict:
+        return _fast_json.loads(data)
+
+# NumPy speeds up bulk report-index builds but is not required.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DATA_FILE = Path("data.jsonl")
+
+
+def _to_cents(amount: Decimal) -> int:
+    return int(amount.quantize(Decimal("0.01")) * 100)
+
+
+# Matches the common "12" / "12.5" / "12.50" amount shapes so they can
+# be turned into cents with int math alone; anything else falls back to
+# the Decimal path.
+_AMOUNT_RE = re.compile(r"(\d+)(?:\.(\d{1,2}))?")
+
+
+def _is_income(tx_type: str) -> bool:
+    # Rows written by this app are already canonical uppercase, so the
+    # two equality checks settle almost every call; .upper() only runs
+    # for hand-edited files.
+    if tx_type == "INCOME":
+        return True
+    if tx_type == "EXPENSE":
+        return False
+    return tx_type.upper() == "INCOME"
+
+
+def _format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    cents = abs(cents)
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+@dataclass(frozen=True, slots=True)
 class Transaction:
     transaction_id: str
     user_id: str
-    amount: Decimal
+    amount: int  # money as integer cents; Decimal/str only at the edges
     category: str
     occurred_on: date
     note: str = ""
     tx_type: str = "EXPENSE"  # "INCOME" or "EXPENSE"
 
     def to_json(self) -> Dict:
-        d = asdict(self)
-        d["amount"] = str(self.amount)
-        d["occurred_on"] = self.occurred_on.isoformat()
-        return d
+        # A plain literal: asdict() does a recursive copying walk that
+        # dominated serialization time on large saves.
+        return {
+            "transaction_id": self.transaction_id,
+            "user_id": self.user_id,
+            "amount": self.amount,
+            "category": self.category,
+            "occurred_on": self.occurred_on.isoformat(),
+            "note": self.note,
+            "tx_type": self.tx_type,
+        }
 
     @staticmethod
     def from_json(d: Dict) -> "Transaction":
-        return Transaction(
-            transaction_id=d["transaction_id"],
-            user_id=d["user_id"],
-            amount=Decimal(d["amount"]),
-            category=d["category"],
-            occurred_on=date.fromisoformat(d["occurred_on"]),
-            note=d.get("note", ""),
-            tx_type=d.get("tx_type", "EXPENSE"),
+        return _parse_row(d)
+
+
+def _make_parser():
+    """Build the row -> Transaction parser with its dependencies bound
+    to local names, and construct positionally: both shave interpreter
+    overhead off the per-row hot path of a full load."""
+    D = Decimal
+    fiso = date.fromisoformat
+    T = Transaction
+    to_cents = _to_cents
+    intern = sys.intern
+
+    def parse(d: Dict) -> Transaction:
+        amount = d["amount"]
+        if type(amount) is not int:
+            # Older files stored amounts as decimal strings like "30.95".
+            amount = to_cents(D(amount))
+        return T(
+            d["transaction_id"],
+            d["user_id"],
+            amount,
+            # Categories and types repeat across most rows; interning
+            # dedupes the strings and makes equality a pointer check.
+            intern(d["category"]),
+            fiso(d["occurred_on"]),
+            d.get("note", ""),
+            intern(d.get("tx_type", "EXPENSE").upper()),
         )
 
+    return parse
+
+
+_parse_row = _make_parser()
+
 
 class TransactionRepository:
-    """Data access: read/write transactions to a JSON file."""
-    def __init__(self, path: Path = DATA_FILE) -> None:
+    """Data access: read/write transactions to a JSON Lines file.
+
+    Each line is one transaction, so appending never rewrites existing
+    content. The pre-JSONL single-document format is still readable and
+    is migrated to JSONL the first time the file is rewritten.
+
+    Rows are cached in memory as the plain dicts decoded from JSON;
+    Transaction objects are only materialized when a caller actually
+    asks for them via load_all. Reporting paths that just need a couple
+    of scalar fields can iterate the raw dicts instead and skip the
+    Decimal/date/dataclass construction entirely. The cache is
+    invalidated if the file changes on disk underneath us.
+
+    Appends are write-behind: they accumulate in a pending buffer and
+    are flushed to disk as one write once ``buffer_size`` transactions
+    pile up (or on explicit flush / interpreter exit), so inserting N
+    transactions costs one file rewrite per batch instead of N.
+    """
+    def __init__(self, path: Path = DATA_FILE, buffer_size: int = 100) -> None:
         self.path = path
+        self.buffer_size = buffer_size
+        self._raw: Optional[List[Dict]] = None
+        self._txs: Optional[List[Transaction]] = None
+        self._cache_signature: Optional[Tuple[int, int]] = None
+        self._pending: List[Transaction] = []
+        self._flushed = 0  # rows already on disk
+        self._legacy_format = False
+        # Reused across writes so serializing does not allocate a fresh
+        # payload buffer every time.
+        self._scratch = bytearray()
+        # Bumped whenever the cached rows are replaced wholesale, so
+        # consumers holding derived state (e.g. report indexes) know to
+        # rebuild rather than apply incremental updates.
+        self.generation = 0
+        atexit.register(self.flush)
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        # mtime alone can miss rewrites within the timestamp
+        # granularity, so pair it with the file size.
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load_raw(self) -> List[Dict]:
+        if self._pending and self._raw is not None:
+            # Unflushed appends live only in memory; the cache is ahead
+            # of the file, so never reload over it.
+            return self._raw
+        signature = self._file_signature()
+        if self._raw is not None and signature == self._cache_signature:
+            return self._raw
+        if signature is None:
+            self._raw = []
+            self._legacy_format = False
+        else:
+            data = self.path.read_bytes()
+            try:
+                rows = [_json_loads(line) for line in data.splitlines() if line]
+            except ValueError:
+                rows = None
+            if rows is None or (len(rows) == 1 and "transactions" in rows[0]):
+                # Pre-JSONL format: one JSON document holding all rows.
+                self._raw = _json_loads(data).get("transactions", [])
+                self._legacy_format = True
+            else:
+                self._raw = rows
+                self._legacy_format = False
+        self._flushed = len(self._raw)
+        self._txs = None
+        self._cache_signature = signature
+        self.generation += 1
+        return self._raw
+
+    def iter_raw(self, start: int = 0) -> Iterator[Dict]:
+        """Yield transactions as raw dicts, without materializing them.
+
+        ``start`` skips that many rows, letting incremental consumers
+        pick up where they left off.
+        """
+        return islice(iter(self._load_raw()), start, None)
 
     def load_all(self) -> List[Transaction]:
-        if not self.path.exists():
-            return []
-        raw = json.loads(self.path.read_text(encoding="utf-8"))
-        return [Transaction.from_json(x) for x in raw.get("transactions", [])]
+        raw = self._load_raw()
+        if self._txs is None:
+            self._txs = []
+        # Materialize only rows added since the last call.
+        self._txs.extend(map(_parse_row, raw[len(self._txs):]))
+        return self._txs
 
     def save_all(self, transactions: List[Transaction]) -> None:
-        payload = {"transactions": [t.to_json() for t in transactions]}
-        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        self.generation += 1
+        self._raw = [t.to_json() for t in transactions]
+        self._txs = list(transactions)
+        self._write()
 
     def append(self, transaction: Transaction) -> None:
-        txs = self.load_all()
-        txs.append(transaction)
-        self.save_all(txs)
+        self.append_batch([transaction])
+
+    def append_batch(self, transactions: List[Transaction]) -> None:
+        self._load_raw().extend(t.to_json() for t in transactions)
+        if self._txs is not None:
+            self._txs.extend(transactions)
+        self._pending.extend(transactions)
+        if len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append any buffered rows to disk as a single write."""
+        if not self._pending:
+            return
+        raw = self._load_raw()
+        if self._legacy_format:
+            # One-time migration: rewrite the old single-document file
+            # as JSONL, pending rows included.
+            self._write()
+            return
+        with self.path.open("ab") as f:
+            f.write(self._serialize(raw[self._flushed:]))
+            f.flush()
+            os.fsync(f.fileno())
+        self._flushed = len(raw)
+        self._cache_signature = self._file_signature()
+        self._pending.clear()
+
+    def _serialize(self, rows: List[Dict]) -> bytearray:
+        buf = self._scratch
+        buf.clear()
+        for d in rows:
+            buf += _json_dumps_line(d)
+            buf += b"\n"
+        return buf
+
+    def _write(self) -> None:
+        # Rewrite atomically: build the new file beside the old one,
+        # fsync once, then swap it into place so a crash mid-write can
+        # never leave a truncated data file.
+        rows = self._raw or []
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(self._serialize(rows))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._legacy_format = False
+        self._flushed = len(rows)
+        self._cache_signature = self._file_signature()
+        self._pending.clear()
 
 
 class ReportService:
-    """Business logic: calculate totals for a month."""
+    """Business logic: calculate totals for a month.
+
+    Totals are kept in an incremental (user_id, year, month) index:
+    each call only folds in transactions added since the last call, so
+    a report after an append is an O(1) lookup instead of a full scan.
+    The index is built from the repository's raw dict rows — year and
+    month come from slicing the ISO date string — so no date or
+    Transaction objects are constructed for reporting.
+    """
     def __init__(self, repo: TransactionRepository) -> None:
         self.repo = repo
-
-    def monthly_totals(self, user_id: str, year: int, month: int) -> Dict[str, Decimal]:
-        txs = self.repo.load_all()
-        income = Decimal("0")
-        expense = Decimal("0")
-        for t in txs:
-            if t.user_id != user_id:
-                continue
-            if t.occurred_on.year == year and t.occurred_on.month == month:
-                if t.tx_type.upper() == "INCOME":
-                    income += t.amount
-                else:
-                    expense += t.amount
-        return {"income": income, "expense": expense, "net": income - expense}
+        self._totals: Dict[Tuple[str, int, int], List[int]] = defaultdict(
+            lambda: [0, 0]
+        )
+        self._indexed_generation = -1
+        self._indexed_count = 0
+        # Formatted results per (user_id, year, month); cleared whenever
+        # the index absorbs any change, so entries are never stale.
+        self._report_cache: Dict[Tuple[str, int, int], Dict[str, str]] = {}
+
+    def _apply(self, d: Dict) -> None:
+        occurred = d["occurred_on"]
+        amount = d["amount"]
+        if not isinstance(amount, int):
+            amount = _to_cents(Decimal(amount))
+        slot = self._totals[(d["user_id"], int(occurred[:4]), int(occurred[5:7]))]
+        if _is_income(d.get("tx_type", "EXPENSE")):
+            slot[0] += amount
+        else:
+            slot[1] += amount
+
+    def _refresh_index(self) -> None:
+        rows = self.repo.iter_raw(self._indexed_count)
+        if self.repo.generation != self._indexed_generation:
+            self._totals.clear()
+            self._report_cache.clear()
+            self._indexed_count = 0
+            self._indexed_generation = self.repo.generation
+            rows = self.repo.iter_raw()
+            if np is not None:
+                all_rows = list(rows)
+                if len(all_rows) >= self._BULK_BUILD_MIN:
+                    self._bulk_build(all_rows)
+                    self._indexed_count = len(all_rows)
+                    return
+                rows = iter(all_rows)
+        applied = False
+        for d in rows:
+            self._apply(d)
+            self._indexed_count += 1
+            applied = True
+        if applied:
+            self._report_cache.clear()
+
+    # Below this many transactions the plain loop wins; above it the
+    # vectorized rebuild is worth the array setup cost.
+    _BULK_BUILD_MIN = 1024
+
+    def _bulk_build(self, rows: List[Dict]) -> None:
+        """Rebuild the whole totals index with NumPy.
+
+        The raw rows are transposed into parallel columns (amount,
+        composite month key, income flag) so the group-and-sum runs as
+        array operations instead of a per-row loop.
+        """
+        n = len(rows)
+        user_codes: Dict[str, int] = {}
+        keys = np.fromiter(
+            (
+                (user_codes.setdefault(d["user_id"], len(user_codes)) * 10000
+                 + int(d["occurred_on"][:4])) * 100 + int(d["occurred_on"][5:7])
+                for d in rows
+            ),
+            dtype=np.int64,
+            count=n,
+        )
+        amounts = np.fromiter(
+            (
+                d["amount"] if isinstance(d["amount"], int)
+                else _to_cents(Decimal(d["amount"]))
+                for d in rows
+            ),
+            dtype=np.int64,
+            count=n,
+        )
+        is_income = np.fromiter(
+            (_is_income(d.get("tx_type", "EXPENSE")) for d in rows),
+            dtype=bool,
+            count=n,
+        )
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        income = np.zeros(len(uniq), dtype=np.int64)
+        expense = np.zeros(len(uniq), dtype=np.int64)
+        np.add.at(income, inverse[is_income], amounts[is_income])
+        np.add.at(expense, inverse[~is_income], amounts[~is_income])
+        users_by_code = list(user_codes)  # insertion order matches the codes
+        for key, inc, exp in zip(uniq.tolist(), income.tolist(), expense.tolist()):
+            user = users_by_code[key // 1000000]
+            year = (key // 100) % 10000
+            self._totals[(user, year, key % 100)] = [inc, exp]
+
+    def monthly_totals(self, user_id: str, year: int, month: int) -> Dict[str, str]:
+        self._refresh_index()
+        key = (user_id, year, month)
+        cached = self._report_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        income, expense = self._totals[key]
+        result = {
+            "income": _format_cents(income),
+            "expense": _format_cents(expense),
+            "net": _format_cents(income - expense),
+        }
+        if len(self._report_cache) >= 512:
+            self._report_cache.clear()
+        self._report_cache[key] = result
+        return dict(result)
 
 
 class ExpenseService:
@@ -125,30 +456,52 @@ class ExpenseService:
         )
         self.repo.append(tx)
 
+        # Both calls share the repository's in-memory rows: the append
+        # lands in its cache and the report folds it into the totals
+        # index, so this never re-reads or re-parses the data file.
         totals = self.reporter.monthly_totals(user_id, occurred_on.year, occurred_on.month)
         return {
             "transaction_id": tx_id,
             "month": f"{occurred_on.year}-{occurred_on.month:02d}",
-            "income": str(totals["income"]),
-            "expense": str(totals["expense"]),
-            "net": str(totals["net"]),
+            "income": totals["income"],
+            "expense": totals["expense"],
+            "net": totals["net"],
         }
 
+    # Random per-process prefix plus a counter: unique within a run,
+    # unlikely to collide across runs, and far cheaper than the old
+    # datetime.now().strftime() call per insert (which also collided
+    # within the same second).
+    _run_id = secrets.token_hex(3)
+    _counter = count(1)
+
     def _new_tx_id(self) -> str:
-        # Simple, readable ID for a prototype (not for production).
-        # Using timestamp keeps collisions unlikely for single-user demos.
-        return "TX-" + datetime.now().strftime("%H%M%S")
+        return f"TX-{self._run_id}-{next(self._counter):06x}"
 
     @staticmethod
-    def _validate_amount(amount_str: str) -> Decimal:
+    def _validate_amount(amount_str: str) -> int:
+        try:
+            s = amount_str.strip()
+        except AttributeError:
+            raise ValueError("Amount must be a valid number (e.g., 12.50).")
+        m = _AMOUNT_RE.fullmatch(s)
+        if m:
+            # Common shape: straight to cents without Decimal.
+            cents = int(m.group(1)) * 100
+            frac = m.group(2)
+            if frac:
+                cents += int(frac) if len(frac) == 2 else int(frac) * 10
+            if cents <= 0:
+                raise ValueError("Amount must be greater than 0.")
+            return cents
         try:
-            amount = Decimal(amount_str.strip())
-        except (InvalidOperation, AttributeError):
+            amount = Decimal(s)
+        except InvalidOperation:
             raise ValueError("Amount must be a valid number (e.g., 12.50).")
         if amount <= 0:
             raise ValueError("Amount must be greater than 0.")
         # Round to cents for money.
-        return amount.quantize(Decimal("0.01"))
+        return _to_cents(amount)
 
     @staticmethod
     def _validate_category(category: str) -> str:
@@ -156,14 +509,26 @@ class ExpenseService:
             raise ValueError("Category is required.")
         if len(category.strip()) > 30:
             raise ValueError("Category must be 30 characters or less.")
-        return category.strip()
+        return sys.intern(category.strip())
 
     @staticmethod
     def _validate_date(date_str: str) -> date:
-        try:
-            d = date.fromisoformat(date_str.strip())
-        except Exception:
-            raise ValueError("Date must be in ISO format YYYY-MM-DD.")
+        s = date_str.strip()
+        if (
+            len(s) == 10 and s[4] == "-" and s[7] == "-"
+            and s[:4].isdigit() and s[5:7].isdigit() and s[8:10].isdigit()
+        ):
+            # Exactly "YYYY-MM-DD": build the date directly and let the
+            # constructor range-check month and day.
+            try:
+                d = date(int(s[:4]), int(s[5:7]), int(s[8:10]))
+            except ValueError:
+                raise ValueError("Date must be in ISO format YYYY-MM-DD.")
+        else:
+            try:
+                d = date.fromisoformat(s)
+            except Exception:
+                raise ValueError("Date must be in ISO format YYYY-MM-DD.")
         # Light business rule for prototype: no future expenses
         if d > date.today():
             raise ValueError("Date cannot be in the future for an expense entry.")
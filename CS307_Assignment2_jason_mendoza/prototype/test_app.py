@@ -12,7 +12,7 @@ from app import TransactionRepository, ReportService, ExpenseService
 
 class TestAddExpenseFeature(unittest.TestCase):
     def setUp(self):
-        self.tmp = Path("test_data.json")
+        self.tmp = Path("test_data.jsonl")
         if self.tmp.exists():
             self.tmp.unlink()
         self.repo = TransactionRepository(self.tmp)
@@ -20,6 +20,9 @@ class TestAddExpenseFeature(unittest.TestCase):
         self.service = ExpenseService(self.repo, self.reporter)
 
     def tearDown(self):
+        # Drain the write-behind buffer so the atexit flush does not
+        # recreate the temp file after we remove it.
+        self.repo.flush()
         if self.tmp.exists():
             self.tmp.unlink()
 
@@ -44,6 +47,20 @@ class TestAddExpenseFeature(unittest.TestCase):
                 date_str="2026-02-10"
             )
 
+    def test_add_expense_reads_from_memory_not_disk(self):
+        self.service.add_expense(
+            user_id="jason",
+            amount_str="10.00",
+            category="Groceries",
+            date_str="2026-02-10"
+        )
+        # Clobber the file behind the repository's back: while the new
+        # row is still buffered, reports must come from memory and not
+        # re-read (or re-parse) the data file.
+        self.tmp.write_text("not json at all")
+        totals = self.reporter.monthly_totals("jason", 2026, 2)
+        self.assertEqual(totals["expense"], "10.00")
+
     def test_validation_rejects_blank_category(self):
         with self.assertRaises(ValueError):
             self.service.add_expense(